@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from typing import ClassVar
 
 
 @dataclass(frozen=True)
@@ -14,19 +15,16 @@ class AcneColors:
     spanish_blue: str = "#0271B1"
     orchid_pink: str = "#F6C6D5"
 
-    @classmethod
-    @property
-    def discrete_palette(cls) -> list[str]:
-        return [
-            cls.pearly_purple,
-            cls.dark_sea_green,
-            cls.mustard,
-            cls.royal_purple,
-            cls.sky_blue,
-            cls.rose_madder,
-            cls.spanish_blue,
-            cls.orchid_pink,
-        ]
+    discrete_palette: ClassVar[tuple[str, ...]] = (
+        pearly_purple,
+        dark_sea_green,
+        mustard,
+        royal_purple,
+        sky_blue,
+        rose_madder,
+        spanish_blue,
+        orchid_pink,
+    )
 
 
 @dataclass(frozen=True)
@@ -1,20 +1,20 @@
 from __future__ import annotations
 
 from collections.abc import Iterable
-from statistics import mean
-from typing import cast
+from typing import Literal
 
-import networkx as nx
 import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 
 from acneviz.colors import AcneColors, DarkMode, LightMode
 from acneviz.plots._protocol import Plot
-from acneviz.utils import clamp
 
 MAX_NODE_SIZE = 500
 MAX_EDGE_WIDTH = 100
+EDGE_BUCKETS = 20
+TOLERANCE = 1e-5
+WEBGL_EDGE_THRESHOLD = 1000
 
 
 class CorrelationNetworkGraph(Plot):
@@ -44,6 +44,9 @@ class CorrelationNetworkGraph(Plot):
         The factor to scale the edge width by, by default 1.0
     opacity_factor : int | float
         The factor to scale the edge opacity by, by default 1.0
+    layout : str
+        How to position the nodes, one of "circular", "spring" or "spectral", by default
+        "circular". The spring and spectral layouts are computed with networkx.
 
     Methods
     -------
@@ -64,6 +67,7 @@ class CorrelationNetworkGraph(Plot):
         node_size_factor: int | float = 1.0,
         edge_width_factor: int | float = 1.0,
         opacity_factor: int | float = 1.0,
+        layout: Literal["circular", "spring", "spectral"] = "circular",
     ) -> None:
         self.size = size
         self.color = color
@@ -71,19 +75,30 @@ class CorrelationNetworkGraph(Plot):
         self.node_size_factor = node_size_factor
         self.edge_width_factor = edge_width_factor
         self.opacity_factor = opacity_factor
+        self.layout = layout
 
         mode = DarkMode if dark_mode else LightMode
 
         self._background_color = mode.background_color
         self._label_color = mode.text_color
 
+        values = _validate_correlation_matrix(data)
+
         self._data = data
-        self._graph = _build_graph_from_correlation_matrix(self._data)
+        self._nodes = data.columns.to_numpy()
+        self._abs_weights = np.abs(values)
+        self._sources, self._targets = _edges(self._abs_weights)
+        self._avg_edge_weights = _avg_edge_weights(self._abs_weights)
         self._figure = self._plot()
 
     def _plot(self) -> go.Figure:
-        # Get node x,y positions
-        self._node_positions = nx.circular_layout(self._graph)
+        self._node_positions = self._layout_nodes()
+
+        # SVG rendering stalls on dense graphs, small graphs keep the crisper SVG
+        if len(self._sources) > WEBGL_EDGE_THRESHOLD:
+            self._trace_type = go.Scattergl
+        else:
+            self._trace_type = go.Scatter
 
         edge_traces = self._edge_traces()
         node_traces = self._node_traces()
@@ -106,95 +121,167 @@ class CorrelationNetworkGraph(Plot):
 
         return plot
 
-    def _edge_traces(self) -> Iterable[go.Scatter]:
-        """Create a line trace for each edge in the graph"""
-        for node_0, node_1, data in self._graph.edges(data=True):  # type: ignore
-            x0, y0 = self._node_positions[node_0]
-            x1, y1 = self._node_positions[node_1]
+    def _layout_nodes(self) -> np.ndarray:
+        """Get the x,y position of each node as an (n_nodes, 2) array"""
+        if self.layout == "circular":
+            return _circular_layout(len(self._nodes))
+
+        if self.layout not in ("spring", "spectral"):
+            raise ValueError("Layout must be one of 'circular', 'spring' or 'spectral'")
+
+        # Only the optional layouts need networkx, so keep it off the default path
+        import networkx as nx
+
+        graph = nx.Graph()
+        graph.add_nodes_from(range(len(self._nodes)))
+        graph.add_weighted_edges_from(
+            zip(
+                self._sources.tolist(),
+                self._targets.tolist(),
+                self._abs_weights[self._sources, self._targets].tolist(),
+            )
+        )
+
+        if self.layout == "spring":
+            positions = nx.spring_layout(graph, seed=0)
+        else:
+            positions = nx.spectral_layout(graph)
+
+        return np.array([positions[node] for node in range(len(self._nodes))])
+
+    def _edge_traces(self) -> Iterable[go.Scatter | go.Scattergl]:
+        """Create a line trace for each bucket of edges with similar correlation.
 
-            correlation = data["weight"]  # type: ignore
+        Plotly supports only one line width and opacity per trace, so edges are grouped
+        into EDGE_BUCKETS buckets by absolute correlation and each bucket is drawn as a
+        single trace of disconnected line segments, styled by the bucket center.
+        """
+        centers = (np.arange(EDGE_BUCKETS) + 0.5) / EDGE_BUCKETS
+        widths = centers * MAX_EDGE_WIDTH * self.edge_width_factor
+        opacities = np.clip(centers * self.opacity_factor, 0, 1)
 
-            yield go.Scatter(
-                x=[x0, x1],
-                y=[y0, y1],
+        abs_correlations = self._abs_weights[self._sources, self._targets]
+        buckets = np.clip(
+            (abs_correlations * EDGE_BUCKETS).astype(int), 0, EDGE_BUCKETS - 1
+        )
+
+        for bucket in np.unique(buckets):
+            in_bucket = buckets == bucket
+            xs, ys = _line_segments(
+                self._node_positions,
+                self._sources[in_bucket],
+                self._targets[in_bucket],
+            )
+
+            yield self._trace_type(
+                x=xs,
+                y=ys,
                 mode="lines",
-                line_width=abs(correlation) * MAX_EDGE_WIDTH * self.edge_width_factor,
+                line_width=widths[bucket],
                 line_color=self.color,
-                opacity=clamp(abs(correlation) * self.opacity_factor, 0, 1),
+                opacity=opacities[bucket],
             )
 
-    def _node_traces(self) -> Iterable[go.Scatter]:
-        """Create a point trace for each node in the graph"""
-
-        for node in self._graph.nodes():
-            node_x, node_y = self._node_positions[node]
-
-            avg_correlation = _avg_edge_weight_of_node(self._graph, cast(str, node))
-
-            yield go.Scatter(
-                x=[node_x],
-                y=[node_y],
-                mode="markers+text",
-                marker=dict(
-                    size=avg_correlation * MAX_NODE_SIZE * self.node_size_factor,
-                    opacity=1,
-                    line_width=5,
-                    color=self._background_color,
-                    line_color=self.color,
-                ),
-                text=node,
-                textfont=dict(size=self.label_size, color=self._label_color),
-                textposition="middle center",
-            )
+    def _node_traces(self) -> Iterable[go.Scatter | go.Scattergl]:
+        """Create a single point trace holding all nodes in the graph"""
+        yield self._trace_type(
+            x=self._node_positions[:, 0],
+            y=self._node_positions[:, 1],
+            mode="markers+text",
+            marker=dict(
+                size=self._avg_edge_weights * MAX_NODE_SIZE * self.node_size_factor,
+                opacity=1,
+                line_width=5,
+                color=self._background_color,
+                line_color=self.color,
+            ),
+            text=self._nodes,
+            textfont=dict(size=self.label_size, color=self._label_color),
+            textposition="middle center",
+        )
+
+
+def _circular_layout(n_nodes: int) -> np.ndarray:
+    """Position the nodes evenly on the unit circle as an (n_nodes, 2) array"""
+    if n_nodes == 1:
+        return np.zeros((1, 2))
+
+    theta = np.linspace(0, 2 * np.pi, n_nodes, endpoint=False)
+    return np.column_stack([np.cos(theta), np.sin(theta)])
 
 
-def _validate_correlation_matrix(correlation_matrix: pd.DataFrame) -> None:
-    """Check that the correlation matrix is valid"""
+def _line_segments(
+    positions: np.ndarray, sources: np.ndarray, targets: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Flatten the edges between source and target nodes into x and y arrays of the form
+    [x0, x1, nan, x0', x1', nan, ...], where nan breaks the line between edges.
+    """
+    segments = np.full((len(sources), 3, 2), np.nan)
+    segments[:, 0] = positions[sources]
+    segments[:, 1] = positions[targets]
+
+    return segments[:, :, 0].ravel(), segments[:, :, 1].ravel()
+
+
+def _validate_correlation_matrix(correlation_matrix: pd.DataFrame) -> np.ndarray:
+    """Check that the correlation matrix is valid and return its values as floats"""
     if not isinstance(correlation_matrix, pd.DataFrame):
         raise TypeError("Correlation matrix must be a pandas DataFrame")
 
+    # Cheap checks first so invalid input fails before the O(N^2) symmetry check
     if not correlation_matrix.index.equals(correlation_matrix.columns):
-        raise ValueError("Correlation matrix must be square")
+        raise ValueError(
+            "Correlation matrix must be square with same index and columns"
+        )
 
-    if not np.allclose(correlation_matrix.values, correlation_matrix.values.T):
-        raise ValueError("Correlation matrix must be symmetric")
+    values = correlation_matrix.to_numpy(dtype=float)
 
-    if not np.allclose(correlation_matrix.values.diagonal(), 1):
+    if not (np.abs(values.diagonal() - 1) <= TOLERANCE).all():
         raise ValueError("Correlation matrix must have 1 on the diagonal")
 
-    if not correlation_matrix.index.equals(correlation_matrix.columns):
-        raise ValueError("Correlation matrix must have same index and columns")
+    if not _is_symmetric(values):
+        raise ValueError("Correlation matrix must be symmetric")
+
+    return values
 
 
-def _build_graph_from_correlation_matrix(correlation_matrix: pd.DataFrame) -> nx.Graph:
-    """Create a graph from the correlation matrix keeping order of nodes"""
-    _validate_correlation_matrix(correlation_matrix)
-    edges = nx.from_pandas_adjacency(correlation_matrix).edges(data=True)
-    graph = nx.Graph()
-    graph.add_edges_from(edges)
-    graph.add_nodes_from(correlation_matrix.columns)
-    graph.remove_edges_from(nx.selfloop_edges(graph))
-    _remove_edges_wo_weight(graph)
+def _is_symmetric(values: np.ndarray) -> bool:
+    """
+    Check that the matrix equals its transpose within TOLERANCE using a single
+    difference buffer. Missing values must be mirrored across the diagonal.
+    """
+    is_missing = np.isnan(values)
+    if not np.array_equal(is_missing, is_missing.T):
+        return False
+
+    difference = np.subtract(values, values.T)
+    np.abs(difference, out=difference)
+
+    return not (difference > TOLERANCE).any()
+
 
-    return graph
+def _edges(abs_weights: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Get the source and target node indices of each edge from the upper triangle of the
+    absolute correlation matrix. Missing and zero correlations do not become edges.
+    """
+    rows, columns = np.triu_indices(len(abs_weights), k=1)
+    weights = abs_weights[rows, columns]
+    is_edge = ~np.isnan(weights) & (weights != 0)
+
+    return rows[is_edge], columns[is_edge]
 
 
-def _remove_edges_wo_weight(graph: nx.Graph):
+def _avg_edge_weights(abs_weights: np.ndarray) -> np.ndarray:
     """
-    Remove edges with missing values inplace.
+    Calculate the average absolute edge weight of each node, ignoring missing and zero
+    correlations. Nodes without edges get an average of 0.
     """
-    graph.remove_edges_from(
-        [
-            (node1, node2)
-            for node1, node2, edge_data in graph.edges(data=True)  # type: ignore
-            if pd.isna(edge_data["weight"])  # type: ignore
-        ]
-    )
-
-
-def _avg_edge_weight_of_node(graph: nx.Graph, node: str) -> float:
-    """Calculate the average edge weight of the given node"""
-    return mean(
-        abs(edge_data["weight"])  # type: ignore
-        for _, _, edge_data in graph.edges(node, data=True)  # type: ignore
-    )
+    is_edge = ~np.isnan(abs_weights) & (abs_weights != 0)
+    np.fill_diagonal(is_edge, False)
+
+    totals = np.where(is_edge, abs_weights, 0).sum(axis=1)
+    counts = is_edge.sum(axis=1)
+
+    return np.divide(totals, counts, out=np.zeros_like(totals), where=counts > 0)
@@ -1,21 +1,45 @@
 from __future__ import annotations
 
+import atexit
 import io
 import math
+import os
+import threading
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
+from typing import Any
 
 import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from joblib import Parallel, delayed
+import plotly.io as pio
+from kaleido.scopes.plotly import PlotlyScope
 from PIL import Image
 from tqdm import tqdm
 
 from acneviz.colors import AcneColors, DarkMode, LightMode
 from acneviz.plots._protocol import Plot
+from acneviz.utils import is_webp
 
 AXIS_EXPANSION_FACTOR = 0.2
+MAX_RENDER_WORKERS = 4
+
+_SCENE_AXIS_STYLE = dict(
+    showticklabels=False,
+    title="",
+    showbackground=False,
+    showline=False,
+    zeroline=False,
+)
+
+_thread_local = threading.local()
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+_scopes: list[PlotlyScope] = []
+_scopes_lock = threading.Lock()
 
 
 class Embedding3D(Plot):
@@ -39,7 +63,7 @@ class Embedding3D(Plot):
         If None, the points will be sized uniformly.
     label_size: int
         The size of the labels on the legend.
-    color_palette: list[str]
+    color_palette: Sequence[str]
         The color palette to be used for coloring the points.
     dark_mode: bool
         Whether to use a dark mode for the plot.
@@ -56,7 +80,7 @@ class Embedding3D(Plot):
         id_column: str | None = None,
         size_column: str | None = None,
         label_size: int = 30,
-        color_palette: list[str] = AcneColors.discrete_palette,
+        color_palette: Sequence[str] = AcneColors.discrete_palette,
         dark_mode: bool = False,
         legend_title: str | None = None,
     ) -> None:
@@ -80,45 +104,81 @@ class Embedding3D(Plot):
         self._figure = self._plot()
 
     def overlay(self, other: Embedding3D) -> Embedding3D:
-        """Overlay another Embedding3D plot on top of this one."""
-        self._figure.add_trace(other._figure.data)
+        """
+        Overlay another Embedding3D plot on top of this one, widening the axes to fit
+        both from their cached data limits.
+        """
+        self._figure.add_traces(other._figure.data)
+
+        self._mins = np.minimum(self._mins, other._mins)
+        self._maxs = np.maximum(self._maxs, other._maxs)
+        x_range, y_range, z_range = _axis_ranges(self._mins, self._maxs)
+        self._figure.update_layout(
+            scene_xaxis_range=x_range,
+            scene_yaxis_range=y_range,
+            scene_zaxis_range=z_range,
+        )
+
         return self
 
     def save_gif(
-        self, path: Path | str, fps: int = 30, speed: float = 30, scale: int | None = 2
+        self, path: Path | str, fps: int = 30, speed: float = 30, scale: int | float = 1
     ) -> None:
         """
         Creates and saves a GIF of a 3D plot, rotating around the Z-axis.
-        'speed' is in deg/s
+        'speed' is in deg/s. If 'path' ends with .webp, an animated WebP is saved
+        instead, which is not limited to a 256 color palette.
+        'scale' defaults to 1, since rendering every frame at a higher resolution is
+        the dominant cost and rarely visible after GIF palettization.
+        Frames are rendered by up to MAX_RENDER_WORKERS threads, each with its own
+        Chromium process. These stay resident after the first call, so later calls
+        start faster, and are shut down when the interpreter exits.
         """
 
-        fig = self._figure
-        x_eye, y_eye, z_eye = (1.2, 1.2, 0.5)
-        step = math.radians(speed / fps)
-        fig.update_layout(scene_camera_eye=dict(x=x_eye, y=y_eye, z=z_eye))
+        eye = np.array([1.2, 1.2, 0.5])
 
-        frames = []
-        for t in np.arange(0, math.radians(360), step):
-            xe, ye, ze = _rotate_around_z(x_eye, y_eye, z_eye, -t)
-            frames.append(dict(x=xe, y=ye, z=ze))
+        # Round to a whole number of frames per turn so the GIF loops seamlessly
+        n_frames = max(1, round(360 * fps / speed))
+        step = math.tau / n_frames
 
-        gif_frames: list[Image.Image] = list(
-            Parallel(n_jobs=-1)(
-                delayed(_render_frame)(fig, frame, scale) for frame in tqdm(frames)
-            )  # type: ignore
-        )
+        # Rotate the eye around the Z-axis for all frames at once
+        thetas = -step * np.arange(n_frames)
+        rotations = _rotation_matrices(np.array([0.0, 0.0, 1.0]), thetas)
+        eyes = np.einsum("nij,j->ni", rotations, eye)
+        frames = [dict(x=x, y=y, z=z) for x, y, z in eyes.tolist()]
+
+        # Serialize the figure once, each frame only swaps in its camera eye, so the
+        # figure itself is never updated or re-validated
+        spec = self._figure.to_dict()
+        render = partial(_render_frame, spec, scale=scale)
+
+        # Frames are decoded and quantized in order as they arrive from the render pool,
+        # but Pillow keeps one copy of every frame until the end and only encodes after
+        # the last one, a P-mode copy for GIF and the decoded frame for WebP
+        png_frames = tqdm(_render_executor().map(render, frames), total=len(frames))
+        gif_frames = map(_decode_png, png_frames)
 
-        gif_frames[0].save(
+        if is_webp(path):
+            format_options = dict(format="WEBP", quality=80, method=4)
+        else:
+            format_options = dict(format="GIF", optimize=False, interlace=False)
+            gif_frames = _quantize_frames(gif_frames)
+
+        next(gif_frames).save(
             path,
             save_all=True,
-            append_images=gif_frames[1:],
-            optimize=False,
+            append_images=gif_frames,
             duration=int(round(1000 / fps, 0)),
             loop=0,
-            interlace=False,
+            **format_options,
         )
 
     def _plot(self) -> go.Figure:
+        columns = [self._data[column] for column in (self._x, self._y, self._z)]
+        self._mins = np.array([column.min() for column in columns])
+        self._maxs = np.array([column.max() for column in columns])
+        x_range, y_range, z_range = _axis_ranges(self._mins, self._maxs)
+
         figure = px.scatter_3d(
             self._data,
             x=self._x,
@@ -131,76 +191,130 @@ class Embedding3D(Plot):
             height=1200,
         )
 
-        x_min, x_max = self._data[self._x].min(), self._data[self._x].max()
-        y_min, y_max = self._data[self._y].min(), self._data[self._y].max()
-        z_min, z_max = self._data[self._z].min(), self._data[self._z].max()
-
-        x_range = (
-            x_min - (x_max - x_min) * AXIS_EXPANSION_FACTOR,
-            x_max + (x_max - x_min) * AXIS_EXPANSION_FACTOR,
+        axis_style = dict(
+            _SCENE_AXIS_STYLE, gridcolor=self._grid_color, gridwidth=self._grid_width
         )
-        y_range = (
-            y_min - (y_max - y_min) * AXIS_EXPANSION_FACTOR,
-            y_max + (y_max - y_min) * AXIS_EXPANSION_FACTOR,
-        )
-        z_range = (
-            z_min - (z_max - z_min) * AXIS_EXPANSION_FACTOR,
-            z_max + (z_max - z_min) * AXIS_EXPANSION_FACTOR,
-        )
-
-        figure.update_layout(
-            plot_bgcolor=self._background_color,
-            paper_bgcolor=self._background_color,
+        layout_patch = dict(
             scene=dict(
-                xaxis=dict(
-                    showticklabels=False,
-                    title="",
-                    visible=True,
-                    range=x_range,
-                    showbackground=False,
-                    gridcolor=self._grid_color,
-                    gridwidth=self._grid_width,
-                    showline=False,
-                    zeroline=False,
-                ),
-                yaxis=dict(
-                    showticklabels=False,
-                    title="",
-                    visible=True,
-                    range=y_range,
-                    showbackground=False,
-                    gridcolor=self._grid_color,
-                    gridwidth=self._grid_width,
-                    showline=False,
-                    zeroline=False,
-                ),
-                zaxis=dict(
-                    showticklabels=False,
-                    title="",
-                    range=z_range,
-                    showbackground=False,
-                    gridcolor=self._grid_color,
-                    gridwidth=self._grid_width,
-                    showline=False,
-                    zeroline=False,
-                ),
+                xaxis=dict(axis_style, range=x_range),
+                yaxis=dict(axis_style, range=y_range),
+                zaxis=dict(axis_style, range=z_range),
             ),
+            plot_bgcolor=self._background_color,
+            paper_bgcolor=self._background_color,
             legend_font_size=self._label_size * 0.9,
             legend_font_color=self._label_color,
         )
 
         if self._legend_title:
-            figure.update_layout(legend_title_text=self._legend_title)
+            layout_patch["legend_title_text"] = self._legend_title
+
+        figure.update_layout(**layout_patch)
 
         return figure
 
 
-def _rotate_around_z(x, y, z, theta):
-    """Rotates a 3D vector around it's Z-axis. 'theta' is in radians."""
-    w = x + 1j * y
-    return (np.real(np.exp(1j * theta) * w), np.imag(np.exp(1j * theta) * w), z)
+def _axis_ranges(mins: np.ndarray, maxs: np.ndarray) -> list[tuple[float, float]]:
+    """Expand the x, y and z data limits by AXIS_EXPANSION_FACTOR on both sides."""
+    margins = (maxs - mins) * AXIS_EXPANSION_FACTOR
+    ranges = np.column_stack([mins - margins, maxs + margins])
+    return list(map(tuple, ranges.tolist()))
+
+
+def _rotation_matrices(axis: np.ndarray, thetas: np.ndarray) -> np.ndarray:
+    """
+    Build the (N, 3, 3) matrices rotating by each angle in 'thetas' around the unit
+    vector 'axis', using Rodrigues' formula. Angles are in radians.
+    """
+    x, y, z = axis
+    cross = np.array([[0, -z, y], [z, 0, -x], [-y, x, 0]])
+    cos = np.cos(thetas)[:, None, None]
+    sin = np.sin(thetas)[:, None, None]
+
+    return cos * np.eye(3) + sin * cross + (1 - cos) * np.outer(axis, axis)
 
 
-def _render_frame(fig: go.Figure, frame: dict[str, float], scale: int) -> Image.Image:
-    fig.update_layout(scene_camera_eye=frame)
-    return Image.open(io.BytesIO(fig.to_image(format="png", scale=scale))).copy()
+def _render_executor() -> ThreadPoolExecutor:
+    """
+    Get the thread pool used for rendering frames. The pool outlives a single call to
+    save_gif, so its threads and their Kaleido scopes are reused by later calls. It is
+    capped at MAX_RENDER_WORKERS, since every thread keeps a Chromium process resident.
+    """
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=min(os.cpu_count() or 1, MAX_RENDER_WORKERS)
+            )
+
+        return _executor
+
+
+@atexit.register
+def _shutdown_renderers() -> None:
+    """Stop the rendering threads and the Chromium processes of their Kaleido scopes."""
+    global _executor
+
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown()
+            _executor = None
+
+    with _scopes_lock:
+        for scope in _scopes:
+            scope._shutdown_kaleido()
+        _scopes.clear()
+
+
+def _kaleido_scope() -> PlotlyScope:
+    """
+    Get the Kaleido scope of the current thread, copying the settings of Plotly's own
+    scope (pio.kaleido.scope) when it is created. Each scope keeps its Chromium process
+    alive, so it is only started once per thread instead of once per frame.
+    """
+    if not hasattr(_thread_local, "scope"):
+        plotly_scope = pio.kaleido.scope
+        scope = PlotlyScope(
+            plotlyjs=plotly_scope.plotlyjs,
+            mathjax=plotly_scope.mathjax,
+            topojson=plotly_scope.topojson,
+            mapbox_access_token=plotly_scope.mapbox_access_token,
+        )
+        scope.chromium_args = plotly_scope.chromium_args
+        _thread_local.scope = scope
+
+        with _scopes_lock:
+            _scopes.append(scope)
+
+    return _thread_local.scope
+
+
+def _render_frame(
+    spec: dict[str, Any], frame: dict[str, float], scale: int | float
+) -> bytes:
+    """Render the figure spec as seen from the camera eye position given by 'frame'."""
+    layout = spec["layout"]
+    scene = layout.get("scene", {})
+    camera = dict(scene.get("camera", {}), eye=frame)
+    frame_spec = dict(spec, layout=dict(layout, scene=dict(scene, camera=camera)))
+
+    return _kaleido_scope().transform(frame_spec, format="png", scale=scale)
+
+
+def _decode_png(png: bytes) -> Image.Image:
+    image = Image.open(io.BytesIO(png))
+    image.load()
+    return image
+
+
+def _quantize_frames(frames: Iterator[Image.Image]) -> Iterator[Image.Image]:
+    """
+    Reduce all frames to the 256 color palette of the first frame. Mapping onto a fixed
+    palette is much cheaper than computing a new palette for every frame.
+    """
+    palette = next(frames).convert("RGB").quantize(method=Image.Quantize.FASTOCTREE)
+    yield palette
+
+    for frame in frames:
+        yield frame.convert("RGB").quantize(palette=palette, dither=Image.Dither.NONE)
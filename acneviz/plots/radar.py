@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
+from functools import cached_property
+
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
@@ -37,7 +40,7 @@ class Radar(Plot):
         The maximum value of the radar plot, defaults to the maximum value in the data
     grid_interval : int | float
         The interval between the grid lines, by default 1
-    color_palette : list[str] | None
+    color_palette : Sequence[str]
         The color palette to use, defaults to AcneColors.discrete_palette
     label_size : int
         The size of the labels, by default 30
@@ -70,7 +73,7 @@ class Radar(Plot):
         min_value: int | float = 0,
         max_value: int | float | None = None,
         grid_interval: int | float = 1,
-        color_palette: list[str] = AcneColors.discrete_palette,
+        color_palette: Sequence[str] = AcneColors.discrete_palette,
         label_size: int = 30,
         tick_size: int = 24,
         height: int = 1080,
@@ -106,11 +109,17 @@ class Radar(Plot):
         self.gridwith = 2
         self.griddash = "dot"
 
-        self._data = data.copy()
+        # Only keep the plotted columns instead of copying the whole frame
+        columns = [variable_column, value_column] + ([id_column] if id_column else [])
+        self._data = data[columns]
         self._variable_column = variable_column
         self._value_column = value_column
         self._id_column = id_column
-        self._figure = self._plot()
+
+    @cached_property
+    def _figure(self) -> go.Figure:  # type: ignore
+        """The figure is only built on first use, e.g. by show() or save()."""
+        return self._plot()
 
     def _plot(self) -> go.Figure:
         figure = px.line_polar(
@@ -16,6 +16,13 @@ def is_png(path: Path | str) -> bool:
     return path.endswith(".png")
 
 
+def is_webp(path: Path | str) -> bool:
+    if isinstance(path, Path):
+        return path.suffix == ".webp"
+
+    return path.endswith(".webp")
+
+
 def validate_png(path: Path | str) -> Path | str:
     if not is_png(path):
         raise ValueError("Path point to a .png file.")
@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import pytest
+
+from acneviz import CorrelationNetworkGraph
+from acneviz.plots.correlation_network_graph import (
+    EDGE_BUCKETS,
+    _avg_edge_weights,
+    _edges,
+    _validate_correlation_matrix,
+)
+
+
+@pytest.fixture
+def correlation_matrix() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame(rng.normal(size=(100, 12)), columns=list("abcdefghijkl"))
+    return data.corr()
+
+
+def test_edge_traces_are_bucketed(correlation_matrix):
+    plot = CorrelationNetworkGraph(correlation_matrix)
+    edge_traces = [trace for trace in plot._figure.data if trace.mode == "lines"]
+
+    n_nodes = len(correlation_matrix)
+    n_segments = sum(len(trace.x) // 3 for trace in edge_traces)
+
+    assert len(edge_traces) <= EDGE_BUCKETS
+    assert n_segments == n_nodes * (n_nodes - 1) // 2
+
+
+def test_edges_skip_zero_correlations(correlation_matrix):
+    correlation_matrix.loc["a", "b"] = correlation_matrix.loc["b", "a"] = 0
+    sources, targets = _edges(correlation_matrix.abs().to_numpy())
+
+    n_nodes = len(correlation_matrix)
+    assert len(sources) == n_nodes * (n_nodes - 1) // 2 - 1
+    assert (0, 1) not in zip(sources, targets)
+    assert (sources < targets).all()
+
+
+def test_avg_edge_weights(correlation_matrix):
+    weights = correlation_matrix.abs().to_numpy()
+    expected = (weights.sum(axis=1) - 1) / (len(weights) - 1)
+
+    np.testing.assert_allclose(_avg_edge_weights(weights), expected)
+
+
+def test_nodes_share_one_trace(correlation_matrix):
+    plot = CorrelationNetworkGraph(correlation_matrix)
+    node_traces = [trace for trace in plot._figure.data if "markers" in trace.mode]
+
+    assert len(node_traces) == 1
+    assert list(node_traces[0].text) == list(correlation_matrix.columns)
+
+
+def test_missing_correlations_are_not_edges(correlation_matrix):
+    correlation_matrix.loc["a", "b"] = correlation_matrix.loc["b", "a"] = np.nan
+    _validate_correlation_matrix(correlation_matrix)
+    sources, targets = _edges(correlation_matrix.abs().to_numpy())
+
+    assert (0, 1) not in zip(sources, targets)
+
+    correlation_matrix.loc["b", "a"] = 0.9
+
+    with pytest.raises(ValueError, match="symmetric"):
+        _validate_correlation_matrix(correlation_matrix)
+
+
+def test_asymmetric_matrix_is_rejected(correlation_matrix):
+    correlation_matrix.loc["a", "b"] += 0.1
+
+    with pytest.raises(ValueError, match="symmetric"):
+        _validate_correlation_matrix(correlation_matrix)
+
+
+def test_dense_graph_uses_webgl():
+    rng = np.random.default_rng(0)
+    correlation_matrix = pd.DataFrame(rng.normal(size=(100, 50))).corr()
+    plot = CorrelationNetworkGraph(correlation_matrix)
+
+    assert all(isinstance(trace, go.Scattergl) for trace in plot._figure.data)
+
+
+@pytest.mark.parametrize("layout", ["circular", "spring", "spectral"])
+def test_layouts(correlation_matrix, layout):
+    plot = CorrelationNetworkGraph(correlation_matrix, layout=layout)
+
+    assert plot._node_positions.shape == (len(correlation_matrix), 2)
+
+
+def test_unknown_layout_is_rejected(correlation_matrix):
+    with pytest.raises(ValueError, match="Layout"):
+        CorrelationNetworkGraph(correlation_matrix, layout="grid")
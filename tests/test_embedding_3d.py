@@ -0,0 +1,95 @@
+import copy
+import io
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+from PIL import Image
+
+from acneviz import Embedding3D
+from acneviz.plots import embedding_3d
+from acneviz.plots.embedding_3d import (
+    _quantize_frames,
+    _render_frame,
+    _rotation_matrices,
+)
+
+
+@pytest.fixture
+def embedding() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(rng.normal(size=(100, 3)), columns=["x", "y", "z"])
+
+
+def _png(color: str, corner_color: str = "white") -> bytes:
+    image = Image.new("RGB", (8, 8), color)
+    image.paste(corner_color, (0, 0, 4, 4))
+
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def test_overlay_widens_axis_ranges(embedding):
+    plot = Embedding3D(embedding, "x", "y", "z")
+    other = Embedding3D(embedding + 10, "x", "y", "z")
+
+    plot.overlay(other)
+
+    assert len(plot._figure.data) == 2
+    x_min, x_max = plot._figure.layout.scene.xaxis.range
+    assert x_min < embedding["x"].min()
+    assert x_max > embedding["x"].max() + 10
+
+
+def test_rotation_matrices_around_z():
+    thetas = np.array([0, np.pi / 2, np.pi])
+    eyes = np.einsum(
+        "nij,j->ni", _rotation_matrices(np.array([0, 0, 1]), thetas), [1, 0, 2]
+    )
+
+    np.testing.assert_allclose(eyes, [[1, 0, 2], [0, 1, 2], [-1, 0, 2]], atol=1e-12)
+
+
+def test_render_frame_sets_eye_without_changing_spec(embedding, monkeypatch):
+    rendered = []
+
+    class Scope:
+        def transform(self, figure, format, scale):
+            rendered.append(figure)
+            return b"png"
+
+    monkeypatch.setattr(embedding_3d, "_kaleido_scope", Scope)
+    spec = Embedding3D(embedding, "x", "y", "z")._figure.to_dict()
+    original = copy.deepcopy(spec)
+    eye = dict(x=1.0, y=2.0, z=3.0)
+
+    assert _render_frame(spec, eye, scale=1) == b"png"
+    assert rendered[0]["layout"]["scene"]["camera"]["eye"] == eye
+    assert spec["layout"] == original["layout"]
+
+
+def test_quantize_frames_share_one_palette():
+    frames = (Image.open(io.BytesIO(_png(color))) for color in ["red", "blue"])
+    quantized = list(_quantize_frames(frames))
+
+    assert [frame.mode for frame in quantized] == ["P", "P"]
+    assert quantized[0].getpalette() == quantized[1].getpalette()
+
+
+@pytest.mark.parametrize("suffix, image_format", [(".gif", "GIF"), (".webp", "WEBP")])
+def test_save_gif_format_follows_suffix(
+    embedding, monkeypatch, tmp_path, suffix, image_format
+):
+    pngs = itertools.cycle([_png("red", "blue"), _png("blue", "red")])
+    monkeypatch.setattr(
+        embedding_3d, "_render_frame", lambda spec, frame, scale: next(pngs)
+    )
+    path = tmp_path / f"embedding{suffix}"
+
+    Embedding3D(embedding, "x", "y", "z").save_gif(path, fps=4, speed=360)
+
+    with Image.open(path) as image:
+        assert image.format == image_format
+        assert image.n_frames == 4
@@ -0,0 +1,22 @@
+from pathlib import Path
+
+import pytest
+
+from acneviz.utils import is_png, is_webp, validate_png
+
+
+@pytest.mark.parametrize("path", ["plot.png", Path("plot.png")])
+def test_is_png(path):
+    assert is_png(path)
+    assert not is_webp(path)
+
+
+@pytest.mark.parametrize("path", ["plot.webp", Path("plot.webp")])
+def test_is_webp(path):
+    assert is_webp(path)
+    assert not is_png(path)
+
+
+def test_validate_png_rejects_other_suffixes():
+    with pytest.raises(ValueError):
+        validate_png("plot.gif")